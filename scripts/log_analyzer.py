@@ -5,14 +5,22 @@ Purpose: Parse application logs, detect issues, store in database
 This is the "detective" that finds problems in your logs
 """
 
+import io
 import re
+import functools
+import multiprocessing
 import os
 import time
 import yaml
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 import psycopg2
-from psycopg2.extras import execute_values
+
+try:
+    from inotify_simple import INotify, flags as inotify_flags
+except ImportError:  # Not installed, or not on Linux: fall back to polling
+    INotify = None
 
 # ============================================
 # CONFIGURATION
@@ -29,8 +37,26 @@ CONFIG = load_config()
 # DATABASE CONNECTION
 # ============================================
 
+# Server-side prepared upsert for detected issues, see insert_issues.
+# Takes one array per column so a whole batch goes in one EXECUTE.
+# xmax = 0 only for freshly inserted rows, which tells new from updated.
+PREPARE_UPSERT_ISSUES = """
+    PREPARE upsert_issues (text[], text[], text[], text[], int[]) AS
+    INSERT INTO issues 
+    (issue_type, severity, description, component, first_seen, last_seen, occurrence_count)
+    SELECT issue_type, severity, description, component, NOW(), NOW(), occurrence_count
+    FROM unnest($1, $2, $3, $4, $5)
+        AS new_issues (issue_type, severity, description, component, occurrence_count)
+    ON CONFLICT (issue_type, component) WHERE resolved = FALSE
+    DO UPDATE SET last_seen = NOW(),
+                  occurrence_count = issues.occurrence_count + EXCLUDED.occurrence_count,
+                  severity = EXCLUDED.severity,
+                  description = EXCLUDED.description
+    RETURNING id, issue_type, severity, (xmax = 0) AS inserted
+"""
+
 def get_db_connection():
-    """Create database connection"""
+    """Create database connection and prepare its statements"""
     try:
         conn = psycopg2.connect(
             host=CONFIG["database"]["host"],
@@ -39,120 +65,103 @@ def get_db_connection():
             user=CONFIG["database"]["user"],
             password=CONFIG["database"]["password"]
         )
-        return conn
     except Exception as e:
         print(f"❌ Database connection failed: {e}")
         return None
+    
+    try:
+        cursor = conn.cursor()
+        cursor.execute(PREPARE_UPSERT_ISSUES)
+        conn.commit()
+        cursor.close()
+    except Exception as e:
+        print(f"❌ Preparing database statements failed: {e}")
+        conn.close()
+        return None
+    
+    return conn
 
 # ============================================
 # LOG PARSING
 # ============================================
 
+@functools.lru_cache(maxsize=None)
+def compile_pattern(pattern: str, flags: int = 0):
+    """Compile a regex, reusing the compiled object for repeated patterns"""
+    return re.compile(pattern, flags)
+
 # Regular expression to parse log lines
 # Format: TIMESTAMP LEVEL [COMPONENT] MESSAGE
-LOG_PATTERN = re.compile(
-    r"(?P<timestamp>\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})\s+"
+LOG_PATTERN = compile_pattern(
+    r"^(?P<timestamp>\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})\s+"
     r"(?P<level>\w+)\s+"
-    r"\[(?P<component>[^\]]+)\]\s+"
+    r"\[\s*(?P<component>[^\]]*[^\]\s])\s*\]\s+"    # Component names are padded
     r"(?P<message>.*)"
 )
 
+# The message extractors are kept as separate patterns: a search for a
+# pattern with a literal in it is much cheaper than folding them into
+# LOG_PATTERN, and each one is skipped when its literal isn't in the message
+
 # Pattern to extract response times from messages
-TIME_PATTERN = re.compile(r"(\d+)ms")
+TIME_PATTERN = compile_pattern(r"(\d+)ms")
 
 # Pattern to extract user IDs
-USER_ID_PATTERN = re.compile(r"user_id[=:](\d+)")
+USER_ID_PATTERN = compile_pattern(r"user_id[=:](\d+)")
 
 # Pattern to extract error codes
-ERROR_CODE_PATTERN = re.compile(r"(404|500|503|\d{3})")
+ERROR_CODE_PATTERN = compile_pattern(r"(\d{3})")
 
-def parse_log_line(line: str) -> Optional[Dict]:
-    """
-    Parse a single log line into structured data
-    
-    Args:
-        line: Raw log line
-        
-    Returns:
-        Dictionary with parsed fields, or None if parsing fails
-    """
-    match = LOG_PATTERN.match(line.strip())
-    
-    if not match:
-        return None
-    
-    # Extract basic fields
-    data = {
-        "timestamp": match.group("timestamp"),
-        "level": match.group("level"),
-        "component": match.group("component"),
-        "message": match.group("message")
-    }
-    
-    # Extract response time if present
-    time_match = TIME_PATTERN.search(data["message"])
-    if time_match:
-        data["response_time"] = int(time_match.group(1))
-    else:
-        data["response_time"] = None
-    
-    # Extract user ID if present
-    user_match = USER_ID_PATTERN.search(data["message"])
-    if user_match:
-        data["user_id"] = int(user_match.group(1))
-    else:
-        data["user_id"] = None
-    
-    # Extract error code if present
-    error_match = ERROR_CODE_PATTERN.search(data["message"])
-    if error_match:
-        data["error_code"] = error_match.group(1)
-    else:
-        data["error_code"] = None
-    
-    return data
+# Known components, interned to small integer IDs while counting; any new
+# component gets the next ID when first seen
+COMPONENTS = ["Database", "API", "Auth", "Cache", "Queue", "Payment"]
+COMPONENT_ID = {component: i for i, component in enumerate(COMPONENTS)}
+
+def get_component_id(component: str) -> int:
+    """Look up a component's ID, registering it if it's new"""
+    component_id = COMPONENT_ID.get(component)
+    if component_id is None:
+        component_id = COMPONENT_ID[component] = len(COMPONENTS)
+        COMPONENTS.append(component)
+    return component_id
 
 # ============================================
 # DATABASE OPERATIONS
 # ============================================
 
-def insert_log_entries(conn, entries: List[Dict]):
+LOG_ENTRY_COLUMNS = (
+    "log_timestamp, log_level, component, message, response_time, error_code, user_id"
+)
+
+# Characters that must be escaped in COPY text format
+COPY_ESCAPES = str.maketrans({
+    "\\": "\\\\",
+    "\t": "\\t",
+    "\n": "\\n",
+    "\r": "\\r",
+})
+
+def insert_log_entries(conn, copy_data: str, entry_count: int):
     """
-    Bulk insert log entries into database
+    Bulk insert log entries into database with COPY FROM STDIN
     
     Args:
         conn: Database connection
-        entries: List of parsed log entries
+        copy_data: Rows in COPY text format, from process_log_lines
+        entry_count: Number of rows in copy_data
     """
-    if not entries:
+    if not entry_count:
         return
     
-    # Prepare data for bulk insert
-    values = [
-        (
-            e["timestamp"],
-            e["level"],
-            e["component"],
-            e["message"],
-            e["response_time"],
-            e["error_code"],
-            e["user_id"]
-        )
-        for e in entries
-    ]
-    
-    query = """
-        INSERT INTO log_entries 
-        (log_timestamp, log_level, component, message, response_time, error_code, user_id)
-        VALUES %s
-    """
-    
     try:
         cursor = conn.cursor()
-        execute_values(cursor, query, values)
+        cursor.copy_expert(
+            f"COPY log_entries ({LOG_ENTRY_COLUMNS}) FROM STDIN WITH (FORMAT text)",
+            io.StringIO(copy_data)
+        )
         conn.commit()
         cursor.close()
-        print(f"  ✅ Inserted {len(entries)} log entries")
+        print(f"  ✅ Inserted {entry_count} log entries")
     except Exception as e:
         print(f"  ❌ Insert failed: {e}")
         conn.rollback()
@@ -161,9 +170,29 @@ def insert_log_entries(conn, entries: List[Dict]):
 # ISSUE DETECTION
 # ============================================
 
-def detect_issues(conn, entries: List[Dict]):
+def new_batch_stats() -> Dict:
+    """Empty issue detection counters, filled in by process_log_lines"""
+    return {
+        "components": {},       # Component -> [entries, errors]
+        "slow_count": 0,        # Responses over 3000ms
+        "slow_total_time": 0,
+        "db_timeouts": 0,
+        "auth_failures": 0,
+    }
+
+def merge_batch_stats(stats: Dict, other: Dict):
+    """Add the counters from other into stats"""
+    for component, (total_count, error_count) in other["components"].items():
+        counts = stats["components"].setdefault(component, [0, 0])
+        counts[0] += total_count
+        counts[1] += error_count
+    
+    for key in ("slow_count", "slow_total_time", "db_timeouts", "auth_failures"):
+        stats[key] += other[key]
+
+def detect_issues(conn, stats: Dict):
     """
-    Analyze log entries and detect issues
+    Detect issues from a batch's counters (from process_log_lines)
     
     Issues to detect:
     1. High error rate
@@ -174,29 +203,8 @@ def detect_issues(conn, entries: List[Dict]):
     """
     issues_to_insert = []
     
-    # Group entries by component and level
-    by_component = {}
-    errors = []
-    slow_responses = []
-    
-    for entry in entries:
-        component = entry["component"]
-        if component not in by_component:
-            by_component[component] = []
-        by_component[component].append(entry)
-        
-        # Collect errors
-        if entry["level"] == "ERROR":
-            errors.append(entry)
-        
-        # Collect slow responses (> 3000ms)
-        if entry["response_time"] and entry["response_time"] > 3000:
-            slow_responses.append(entry)
-    
     # ISSUE 1: High error rate per component
-    for component, comp_entries in by_component.items():
-        error_count = sum(1 for e in comp_entries if e["level"] == "ERROR")
-        total_count = len(comp_entries)
+    for component, (total_count, error_count) in stats["components"].items():
         error_rate = (error_count / total_count * 100) if total_count > 0 else 0
         
         if error_rate > 10:  # More than 10% errors
@@ -209,42 +217,37 @@ def detect_issues(conn, entries: List[Dict]):
             })
     
     # ISSUE 2: Database timeouts
-    db_timeouts = [
-        e for e in errors 
-        if e["component"] == "Database" and "timeout" in e["message"].lower()
-    ]
-    if len(db_timeouts) > 0:
+    db_timeouts = stats["db_timeouts"]
+    if db_timeouts > 0:
         issues_to_insert.append({
             "issue_type": "Database Timeout",
-            "severity": "CRITICAL" if len(db_timeouts) > 5 else "HIGH",
-            "description": f"Database timeouts detected: {len(db_timeouts)} occurrences",
+            "severity": "CRITICAL" if db_timeouts > 5 else "HIGH",
+            "description": f"Database timeouts detected: {db_timeouts} occurrences",
             "component": "Database",
-            "occurrence_count": len(db_timeouts)
+            "occurrence_count": db_timeouts
         })
     
     # ISSUE 3: Slow API responses
-    if len(slow_responses) > 0:
-        avg_time = sum(e["response_time"] for e in slow_responses) / len(slow_responses)
+    slow_count = stats["slow_count"]
+    if slow_count > 0:
+        avg_time = stats["slow_total_time"] / slow_count
         issues_to_insert.append({
             "issue_type": "Slow Response Time",
             "severity": "MEDIUM",
-            "description": f"Slow responses detected: {len(slow_responses)} requests averaging {avg_time:.0f}ms",
+            "description": f"Slow responses detected: {slow_count} requests averaging {avg_time:.0f}ms",
             "component": "API",
-            "occurrence_count": len(slow_responses)
+            "occurrence_count": slow_count
         })
     
     # ISSUE 4: Failed authentication attempts
-    auth_failures = [
-        e for e in errors 
-        if e["component"] == "Auth" and ("failed" in e["message"].lower() or "invalid" in e["message"].lower())
-    ]
-    if len(auth_failures) > 5:
+    auth_failures = stats["auth_failures"]
+    if auth_failures > 5:
         issues_to_insert.append({
             "issue_type": "Authentication Failures",
             "severity": "HIGH",
-            "description": f"Multiple failed authentication attempts: {len(auth_failures)} occurrences",
+            "description": f"Multiple failed authentication attempts: {auth_failures} occurrences",
             "component": "Auth",
-            "occurrence_count": len(auth_failures)
+            "occurrence_count": auth_failures
         })
     
     # Insert issues into database
@@ -253,62 +256,205 @@ def detect_issues(conn, entries: List[Dict]):
 def insert_issues(conn, issues: List[Dict]):
     """
     Insert or update issues in database
+    
+    All issues are upserted in one EXECUTE of the upsert_issues prepared
+    statement: an open issue with the same type and component gets its
+    counts and details updated, anything else is inserted as a new issue.
     """
     if not issues:
         return
     
+    # One array per column, in the statement's parameter order
+    params = (
+        [issue["issue_type"] for issue in issues],
+        [issue["severity"] for issue in issues],
+        [issue["description"] for issue in issues],
+        [issue["component"] for issue in issues],
+        [issue["occurrence_count"] for issue in issues]
+    )
+    
     cursor = conn.cursor()
+    cursor.execute("EXECUTE upsert_issues (%s, %s, %s, %s, %s)", params)
     
-    for issue in issues:
-        # Check if similar issue already exists (not resolved, same type/component)
-        cursor.execute("""
-            SELECT id, occurrence_count, first_seen 
-            FROM issues 
-            WHERE issue_type = %s 
-              AND component = %s 
-              AND resolved = FALSE
-            ORDER BY last_seen DESC
-            LIMIT 1
-        """, (issue["issue_type"], issue["component"]))
-        
-        existing = cursor.fetchone()
-        
-        if existing:
-            # Update existing issue
-            issue_id, old_count, first_seen = existing
-            new_count = old_count + issue["occurrence_count"]
-            
-            cursor.execute("""
-                UPDATE issues 
-                SET last_seen = NOW(),
-                    occurrence_count = %s,
-                    severity = %s,
-                    description = %s
-                WHERE id = %s
-            """, (new_count, issue["severity"], issue["description"], issue_id))
-            
-            print(f"  🔄 Updated issue #{issue_id}: {issue['issue_type']}")
+    for issue_id, issue_type, severity, inserted in cursor.fetchall():
+        if inserted:
+            print(f"  🚨 New issue #{issue_id}: {issue_type} - {severity}")
         else:
-            # Insert new issue
-            cursor.execute("""
-                INSERT INTO issues 
-                (issue_type, severity, description, component, first_seen, last_seen, occurrence_count)
-                VALUES (%s, %s, %s, %s, NOW(), NOW(), %s)
-                RETURNING id
-            """, (
-                issue["issue_type"],
-                issue["severity"],
-                issue["description"],
-                issue["component"],
-                issue["occurrence_count"]
-            ))
-            
-            issue_id = cursor.fetchone()[0]
-            print(f"  🚨 New issue #{issue_id}: {issue['issue_type']} - {issue['severity']}")
+            print(f"  🔄 Updated issue #{issue_id}: {issue_type}")
     
     conn.commit()
     cursor.close()
 
+# ============================================
+# BATCH PROCESSING
+# ============================================
+
+# Batches at least this big (e.g. catching up on a whole file at startup)
+# are processed across worker processes
+PARALLEL_MIN_LINES = 50000
+
+def process_log_lines(lines: List[str]):
+    """
+    Parse a batch of log lines into COPY data and issue counters
+    
+    Everything happens in a single pass: each line is matched once,
+    written straight out as a row in COPY text format, and counted for
+    issue detection. No parsed entries are kept in between. Lines that
+    don't match are skipped.
+    
+    Args:
+        lines: Raw log lines
+        
+    Returns:
+        COPY data for insert_log_entries, number of entries,
+        counters for detect_issues
+    """
+    match_line = LOG_PATTERN.match
+    search_time = TIME_PATTERN.search
+    search_user_id = USER_ID_PATTERN.search
+    search_error_code = ERROR_CODE_PATTERN.search
+    component_ids = COMPONENT_ID
+    escapes = COPY_ESCAPES
+    
+    rows = []
+    add_row = rows.append
+    
+    # Per-component counts, in lists indexed by component ID
+    total_by_component = [0] * len(COMPONENTS)
+    errors_by_component = [0] * len(COMPONENTS)
+    database_id = COMPONENT_ID["Database"]
+    auth_id = COMPONENT_ID["Auth"]
+    slow_count = 0
+    slow_total_time = 0
+    db_timeouts = 0
+    auth_failures = 0
+    
+    for line in lines:
+        match = match_line(line.strip())
+        if not match:
+            continue
+        
+        timestamp, level, component, message = match.groups()
+        
+        component_id = component_ids.get(component)
+        if component_id is None:
+            component_id = get_component_id(component)
+            total_by_component.append(0)
+            errors_by_component.append(0)
+        total_by_component[component_id] += 1
+        
+        # Extract response time if present, counting slow ones (> 3000ms).
+        # Numbers go through int(): \d also matches non-ASCII digits, which
+        # the database would reject
+        response_time = "\\N"
+        if "ms" in message:
+            time_match = search_time(message)
+            if time_match:
+                response_ms = int(time_match.group(1))
+                response_time = str(response_ms)
+                if response_ms > 3000:
+                    slow_count += 1
+                    slow_total_time += response_ms
+        
+        # Extract user ID if present
+        user_id = "\\N"
+        if "user_id" in message:
+            user_match = search_user_id(message)
+            if user_match:
+                user_id = str(int(user_match.group(1)))
+        
+        # Extract error code if present
+        error_match = search_error_code(message)
+        error_code = error_match.group(1) if error_match else "\\N"
+        
+        # Count errors, and the error kinds we look for. The level is
+        # compared as a string: it is only checked here, so interning it
+        # would just add a dict lookup per line
+        if level == "ERROR":
+            errors_by_component[component_id] += 1
+            
+            # Only these few messages need lowercasing for the keyword checks
+            if component_id == database_id:
+                if "timeout" in message.lower():
+                    db_timeouts += 1
+            elif component_id == auth_id:
+                message_lc = message.lower()
+                if "failed" in message_lc or "invalid" in message_lc:
+                    auth_failures += 1
+        
+        # Row in LOG_ENTRY_COLUMNS order
+        add_row(
+            f"{timestamp}\t{level}\t{component.translate(escapes)}\t"
+            f"{message.translate(escapes)}\t{response_time}\t{error_code}\t{user_id}\n"
+        )
+    
+    # Key the per-component counts by name, so batches can be merged
+    stats = new_batch_stats()
+    stats["components"] = {
+        COMPONENTS[component_id]: [total_count, errors_by_component[component_id]]
+        for component_id, total_count in enumerate(total_by_component)
+        if total_count
+    }
+    stats["slow_count"] = slow_count
+    stats["slow_total_time"] = slow_total_time
+    stats["db_timeouts"] = db_timeouts
+    stats["auth_failures"] = auth_failures
+    
+    return "".join(rows), len(rows), stats
+
+def available_cpu_count() -> int:
+    """Number of CPUs this process may run on (honours affinity and cpusets)"""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+def create_parse_pool():
+    """
+    Start worker processes for parsing large batches
+    
+    Returns:
+        Process pool, or None on a single CPU
+    """
+    processes = available_cpu_count()
+    if processes < 2:
+        return None
+    
+    # Spawn fresh workers rather than forking: the database writer thread
+    # may be in the middle of a COPY, and a forked child could inherit
+    # locks that thread is holding
+    return multiprocessing.get_context("spawn").Pool(processes)
+
+def process_log_lines_parallel(lines: List[str], pool=None):
+    """
+    Process a large batch of log lines across worker processes
+    
+    Falls back to process_log_lines for small batches or without a pool.
+    
+    Args:
+        lines: Raw log lines
+        pool: Worker pool from create_parse_pool, kept open between batches
+        
+    Returns:
+        Same as process_log_lines
+    """
+    if pool is None or len(lines) < PARALLEL_MIN_LINES:
+        return process_log_lines(lines)
+    
+    # One contiguous chunk per CPU, so line order is kept
+    chunk_size = -(-len(lines) // available_cpu_count())
+    chunks = [lines[i:i + chunk_size] for i in range(0, len(lines), chunk_size)]
+    
+    results = pool.map(process_log_lines, chunks)
+    
+    stats = new_batch_stats()
+    for _, _, chunk_stats in results:
+        merge_batch_stats(stats, chunk_stats)
+    
+    copy_data = "".join(chunk_data for chunk_data, _, _ in results)
+    entry_count = sum(chunk_count for _, chunk_count, _ in results)
+    
+    return copy_data, entry_count, stats
+
 # ============================================
 # FILE MONITORING
 # ============================================
@@ -321,48 +467,127 @@ def get_latest_log_file():
     if not os.path.exists(log_dir):
         return None
     
-    log_files = [
-        f for f in os.listdir(log_dir)
-        if f.startswith(prefix) and f.endswith(".log")
-    ]
+    # Single pass over the directory, keeping the newest matching name
+    with os.scandir(log_dir) as entries:
+        latest = max(
+            (e for e in entries if e.name.startswith(prefix) and e.name.endswith(".log")),
+            key=lambda e: e.name,
+            default=None
+        )
     
-    if not log_files:
-        return None
+    return latest.path if latest else None
+
+# How much to read from the log file per read() call
+READ_CHUNK_SIZE = 1 << 20  # 1 MB
+
+# Most new data handled in one batch; a bigger backlog (e.g. at startup)
+# is worked through in batches of this size, which bounds memory use
+MAX_BATCH_BYTES = 8 << 20  # 8 MB
+
+def open_log_file(filepath):
+    """
+    Open a log file for tailing
     
-    # Get most recent file
-    log_files.sort(reverse=True)
-    return os.path.join(log_dir, log_files[0])
+    Returns:
+        Raw file descriptor, or None if the file doesn't exist
+    """
+    try:
+        return os.open(filepath, os.O_RDONLY)
+    except FileNotFoundError:
+        return None
 
-def tail_file(filepath, last_position=0):
+def log_file_replaced(filepath, fd) -> bool:
+    """Check whether filepath now points to a different file than fd (rotation)"""
+    try:
+        return os.stat(filepath).st_ino != os.fstat(fd).st_ino
+    except FileNotFoundError:
+        # Keep draining the old file until a new one shows up
+        return False
+
+def tail_file(fd, pending=b""):
     """
-    Read new lines from file (like 'tail -f')
+    Read new lines from an open file (like 'tail -f')
+    
+    Reads at most MAX_BATCH_BYTES per call; if there is more, the caller
+    should call again straight away. A trailing line without a newline is
+    not returned yet: it is handed back as pending and completed on the
+    next call.
     
     Args:
-        filepath: Path to log file
-        last_position: File position from last read
+        fd: File descriptor from open_log_file
+        pending: Incomplete line left over from the last read
         
     Returns:
-        List of new lines, new file position
+        List of new lines, new pending bytes, whether more data may be waiting
+    """
+    # Start over if the file was truncated
+    if os.fstat(fd).st_size < os.lseek(fd, 0, os.SEEK_CUR):
+        os.lseek(fd, 0, os.SEEK_SET)
+        pending = b""
+    
+    chunks = [pending]
+    bytes_read = 0
+    while bytes_read < MAX_BATCH_BYTES:
+        chunk = os.read(fd, min(READ_CHUNK_SIZE, MAX_BATCH_BYTES - bytes_read))
+        if not chunk:
+            break
+        chunks.append(chunk)
+        bytes_read += len(chunk)
+    
+    lines = b"".join(chunks).split(b"\n")
+    del chunks
+    pending = lines.pop()
+    
+    new_lines = [line.decode("utf-8", errors="replace") for line in lines]
+    return new_lines, pending, bytes_read >= MAX_BATCH_BYTES
+
+# Longest time to wait between checks of the log directory
+POLL_INTERVAL = 5  # seconds
+
+def create_log_watcher(log_dir):
+    """
+    Watch the log directory for written, created or moved-in files
+    
+    Returns:
+        INotify watcher, or None if inotify isn't available (then we poll)
     """
+    if INotify is None:
+        print(f"⚠️  inotify_simple not installed, polling every {POLL_INTERVAL}s instead")
+        return None
+    
+    if not os.path.isdir(log_dir):
+        print(f"⚠️  {log_dir} not found, polling every {POLL_INTERVAL}s instead")
+        return None
+    
     try:
-        with open(filepath, "r") as f:
-            # Seek to last position
-            f.seek(last_position)
-            
-            # Read new lines
-            new_lines = f.readlines()
-            
-            # Get new position
-            new_position = f.tell()
-            
-            return new_lines, new_position
-    except FileNotFoundError:
-        return [], last_position
+        watcher = INotify()
+        watcher.add_watch(
+            log_dir,
+            inotify_flags.MODIFY | inotify_flags.CREATE | inotify_flags.MOVED_TO
+        )
+        return watcher
+    except OSError as e:
+        print(f"⚠️  inotify unavailable, polling instead: {e}")
+        return None
+
+def wait_for_changes(watcher):
+    """Block until the log directory changes, or POLL_INTERVAL passes"""
+    if watcher is None:
+        time.sleep(POLL_INTERVAL)
+        return
+    
+    # Drains all pending events; the timeout is in milliseconds
+    watcher.read(timeout=POLL_INTERVAL * 1000)
 
 # ============================================
 # MAIN LOOP
 # ============================================
 
+def store_and_analyze(conn, copy_data: str, entry_count: int, stats: Dict):
+    """Insert a processed batch and detect issues in it (runs on the DB thread)"""
+    insert_log_entries(conn, copy_data, entry_count)
+    detect_issues(conn, stats)
+
 def main():
     """
     Main function: Monitor log files and analyze continuously
@@ -377,53 +602,98 @@ def main():
         print("❌ Cannot connect to database. Exiting.")
         return
     
-    last_position = 0
+    watcher = create_log_watcher(CONFIG["logging"]["log_directory"])
+    
+    # Database work runs on its own thread, so the next batch can be read
+    # and parsed while the previous one is being written
+    db_writer = ThreadPoolExecutor(max_workers=1)
+    db_write = None
+    
+    # Started on the first large batch and reused, since starting the
+    # workers costs about as much as parsing a small batch
+    parse_pool = None
+    
+    log_fd = None
+    pending = b""
     current_file = None
     
     try:
         while True:
+            # Surface a failed database write as soon as it's done, rather
+            # than when the next batch is ready
+            if db_write is not None and db_write.done():
+                finished_write, db_write = db_write, None
+                finished_write.result()
+            
             # Check for latest log file
             log_file = get_latest_log_file()
             
             if not log_file:
                 print("⏳ Waiting for log file...")
-                time.sleep(5)
+                wait_for_changes(watcher)
                 continue
             
-            # If file changed, reset position
-            if log_file != current_file:
+            # If file changed or was rotated, reopen it from the start
+            if log_file != current_file or log_file_replaced(log_file, log_fd):
+                if log_fd is not None:
+                    os.close(log_fd)
+                    log_fd = None
+                
+                log_fd = open_log_file(log_file)
+                if log_fd is None:
+                    current_file = None
+                    wait_for_changes(watcher)
+                    continue
+                
                 print(f"📂 Now monitoring: {log_file}")
                 current_file = log_file
-                last_position = 0
+                pending = b""
             
             # Read new lines
-            new_lines, last_position = tail_file(log_file, last_position)
+            new_lines, pending, more_waiting = tail_file(log_fd, pending)
             
             if new_lines:
                 print(f"\n[{datetime.now().strftime('%H:%M:%S')}] Processing {len(new_lines)} new log entries...")
                 
-                # Parse all lines
-                parsed_entries = []
-                for line in new_lines:
-                    parsed = parse_log_line(line)
-                    if parsed:
-                        parsed_entries.append(parsed)
+                # Parse all lines into COPY data and issue counters
+                if parse_pool is None and len(new_lines) >= PARALLEL_MIN_LINES:
+                    parse_pool = create_parse_pool()
+                copy_data, entry_count, stats = process_log_lines_parallel(new_lines, parse_pool)
                 
-                if parsed_entries:
-                    # Insert into database
-                    insert_log_entries(conn, parsed_entries)
+                if entry_count:
+                    # Keep at most one batch in flight
+                    if db_write is not None:
+                        finished_write, db_write = db_write, None
+                        finished_write.result()
                     
-                    # Detect issues
-                    detect_issues(conn, parsed_entries)
+                    # Insert into database and detect issues
+                    db_write = db_writer.submit(
+                        store_and_analyze, conn, copy_data, entry_count, stats
+                    )
             
-            # Wait before next check
-            time.sleep(5)
+            # Wait until the log directory changes, unless we're still
+            # working through a backlog
+            if not more_waiting:
+                wait_for_changes(watcher)
             
     except KeyboardInterrupt:
         print("\n\n✅ Stopped log analyzer")
     finally:
+        # Let the last batch finish before closing the connection
+        db_writer.shutdown(wait=True)
+        if parse_pool is not None:
+            parse_pool.terminate()
+            parse_pool.join()
+        if log_fd is not None:
+            os.close(log_fd)
+        if watcher is not None:
+            watcher.close()
         if conn:
             conn.close()
+        
+        # Don't drop a failure from the last batch
+        if db_write is not None:
+            db_write.result()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
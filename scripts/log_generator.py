@@ -6,8 +6,10 @@ This creates realistic logs with errors, warnings, slow queries, etc.
 """
 
 import random
+import string
+import functools
 import time
-from datetime import datetime, timedelta
+from datetime import datetime
 import os
 
 # ============================================
@@ -27,6 +29,12 @@ LEVEL_WEIGHTS = {
     "DEBUG": 2    # 2% of logs
 }
 
+# Writes are buffered and pushed to disk every FLUSH_EVERY_LINES lines
+# or FLUSH_INTERVAL seconds, whichever comes first
+WRITE_BUFFER_SIZE = 1 << 16  # 64 KB
+FLUSH_EVERY_LINES = 100
+FLUSH_INTERVAL = 5  # seconds, same as the analyzer's polling interval
+
 # ============================================
 # MESSAGE TEMPLATES
 # ============================================
@@ -143,12 +151,16 @@ MESSAGES = {
 # HELPER FUNCTIONS
 # ============================================
 
+@functools.lru_cache(maxsize=128)
+def format_timestamp(epoch_seconds):
+    """Format a whole second as a log timestamp (cached, strftime is slow)"""
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(epoch_seconds))
+
 def generate_timestamp():
     """Generate realistic timestamp (slightly in past)"""
     # Random time in last 60 seconds
     seconds_ago = random.randint(0, 60)
-    timestamp = datetime.now() - timedelta(seconds=seconds_ago)
-    return timestamp.strftime("%Y-%m-%d %H:%M:%S")
+    return format_timestamp(int(time.time()) - seconds_ago)
 
 def choose_log_level():
     """Choose log level based on probability weights"""
@@ -161,28 +173,56 @@ def choose_log_level():
     
     return random.choices(levels, weights=weights)[0]
 
-def generate_values():
-    """Generate random values for message templates"""
-    return {
-        "time": random.randint(50, 5000),  # Response time in ms
-        "pool": random.randint(10, 95),    # Connection pool count
-        "rows": random.randint(100, 10000), # Database rows
-        "query": "SELECT * FROM users WHERE id = 12345",
-        "user_id": random.randint(1000, 9999),
-        "id": random.randint(1, 1000),
-        "endpoint": random.choice(["/api/users", "/api/orders", "/api/products"]),
-        "count": random.randint(50, 95),
-        "size": random.randint(5, 50),
-        "error": random.choice(["Invalid input", "Connection refused", "Timeout"]),
-        "key": f"cache_key_{random.randint(1, 100)}",
-        "rate": random.randint(40, 80),
-        "queue": random.choice(["orders", "emails", "notifications"]),
-        "worker_id": random.randint(1, 10),
-        "amount": f"{random.randint(10, 500)}.{random.randint(0, 99):02d}",
-        "transaction_id": f"TXN{random.randint(100000, 999999)}",
-        "attempt": random.randint(1, 3),
-        "ip": f"192.168.{random.randint(1, 255)}.{random.randint(1, 255)}",
+# Random value generators for the {fields} in message templates
+VALUE_GENERATORS = {
+    "time": lambda: random.randint(50, 5000),  # Response time in ms
+    "pool": lambda: random.randint(10, 95),    # Connection pool count
+    "rows": lambda: random.randint(100, 10000), # Database rows
+    "query": lambda: "SELECT * FROM users WHERE id = 12345",
+    "user_id": lambda: random.randint(1000, 9999),
+    "id": lambda: random.randint(1, 1000),
+    "endpoint": lambda: random.choice(["/api/users", "/api/orders", "/api/products"]),
+    "count": lambda: random.randint(50, 95),
+    "size": lambda: random.randint(5, 50),
+    "error": lambda: random.choice(["Invalid input", "Connection refused", "Timeout"]),
+    "key": lambda: f"cache_key_{random.randint(1, 100)}",
+    "rate": lambda: random.randint(40, 80),
+    "queue": lambda: random.choice(["orders", "emails", "notifications"]),
+    "worker_id": lambda: random.randint(1, 10),
+    "amount": lambda: f"{random.randint(10, 500)}.{random.randint(0, 99):02d}",
+    "transaction_id": lambda: f"TXN{random.randint(100000, 999999)}",
+    "attempt": lambda: random.randint(1, 3),
+    "ip": lambda: f"192.168.{random.randint(1, 255)}.{random.randint(1, 255)}",
+}
+
+def compile_template(template):
+    """
+    Turn a message template into a function that renders it
+    
+    The template is parsed once, and the render function only generates
+    the values for the fields that template actually uses.
+    """
+    plan = []
+    for literal, field, spec, _ in string.Formatter().parse(template):
+        generator = VALUE_GENERATORS[field] if field is not None else None
+        plan.append((literal, generator, spec or ""))
+    
+    def render():
+        return "".join([
+            literal + (format(generator(), spec) if generator else "")
+            for literal, generator, spec in plan
+        ])
+    
+    return render
+
+# Render functions for every template, same layout as MESSAGES
+COMPILED_MESSAGES = {
+    component: {
+        level: [compile_template(template) for template in templates]
+        for level, templates in levels.items()
     }
+    for component, levels in MESSAGES.items()
+}
 
 def generate_log_entry():
     """Generate a single log entry"""
@@ -190,13 +230,9 @@ def generate_log_entry():
     level = choose_log_level()
     component = random.choice(COMPONENTS)
     
-    # Get message template for this component and level
-    message_templates = MESSAGES[component][level]
-    message_template = random.choice(message_templates)
-    
-    # Fill in the template with random values
-    values = generate_values()
-    message = message_template.format(**values)
+    # Pick a message template for this component and level, and fill it in
+    render_message = random.choice(COMPILED_MESSAGES[component][level])
+    message = render_message()
     
     # Format: TIMESTAMP LEVEL [COMPONENT] MESSAGE
     log_line = f"{timestamp} {level:5} [{component:10}] {message}"
@@ -225,14 +261,24 @@ def main():
     print(f"⚠️  Press Ctrl+C to stop\n")
     
     entry_count = 0
+    unflushed_lines = 0
+    last_flush = time.monotonic()
     
     try:
-        with open(log_file, "a") as f:  # "a" = append mode
+        with open(log_file, "a", buffering=WRITE_BUFFER_SIZE) as f:  # "a" = append mode
             while True:
                 # Generate and write log entry
                 log_entry = generate_log_entry()
                 f.write(log_entry + "\n")
-                f.flush()  # Force write to disk immediately
+                unflushed_lines += 1
+                
+                # Push buffered lines to disk in batches
+                now = time.monotonic()
+                if unflushed_lines >= FLUSH_EVERY_LINES or now - last_flush >= FLUSH_INTERVAL:
+                    f.flush()
+                    os.fsync(f.fileno())
+                    unflushed_lines = 0
+                    last_flush = now
                 
                 # Print to console too
                 entry_count += 1
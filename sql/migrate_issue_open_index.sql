@@ -0,0 +1,47 @@
+-- ============================================
+-- MIGRATION: one open issue per type and component
+-- Purpose: Add idx_issue_open to a database created
+-- before it was part of schema.sql, and trim the
+-- padding older analyzers stored in component names
+-- ============================================
+-- The analyzer upserts issues with
+-- ON CONFLICT (issue_type, component) WHERE resolved = FALSE,
+-- which fails without this index. Safe to run more than once.
+
+BEGIN;
+
+-- Rebuilt below, once component names are normalized
+DROP INDEX IF EXISTS idx_issue_open;
+
+-- Older analyzers stored component names padded as in the log file
+-- ("Database  "); the analyzer now stores them trimmed ("Database").
+-- Without this, old open issues never match the upsert and reports
+-- split each component into two rows.
+UPDATE log_entries
+SET component = btrim(component)
+WHERE component <> btrim(component);
+
+UPDATE issues
+SET component = btrim(component)
+WHERE component <> btrim(component);
+
+-- Older analyzer versions could leave several open issues for the
+-- same type and component. Keep the most recent one open and
+-- resolve the rest, otherwise the unique index can't be built.
+UPDATE issues
+SET resolved = TRUE,
+    resolved_at = NOW(),
+    resolved_by = 'migration',
+    notes = 'Merged into a newer open issue of the same type'
+WHERE resolved = FALSE
+  AND id NOT IN (
+      SELECT DISTINCT ON (issue_type, component) id
+      FROM issues
+      WHERE resolved = FALSE
+      ORDER BY issue_type, component, last_seen DESC, id DESC
+  );
+
+CREATE UNIQUE INDEX idx_issue_open ON issues(issue_type, component)
+    WHERE resolved = FALSE;
+
+COMMIT;
@@ -133,6 +133,13 @@ CREATE TABLE issues (
 CREATE INDEX idx_issue_severity ON issues(severity);
 CREATE INDEX idx_issue_resolved ON issues(resolved);
 
+-- Only one open issue per type and component
+-- Lets the analyzer upsert issues with ON CONFLICT
+-- Existing databases: run migrate_issue_open_index.sql to add it
+-- (it also trims padded component names left by older analyzers)
+CREATE UNIQUE INDEX idx_issue_open ON issues(issue_type, component)
+    WHERE resolved = FALSE;
+
 -- ============================================
 -- TABLE 4: health_reports
 -- Purpose: Daily summaries for management